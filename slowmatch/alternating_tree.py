@@ -1,5 +1,6 @@
 import dataclasses
-from typing import List, Tuple, Optional, TYPE_CHECKING, Any
+import itertools
+from typing import List, Tuple, Optional, TYPE_CHECKING, Any, Iterator
 from slowmatch.graph_fill_region import GraphFillRegion
 from slowmatch.region_path import RegionPath, RegionEdge
 from slowmatch.compressed_edge import CompressedEdge
@@ -11,6 +12,8 @@ if TYPE_CHECKING:
 @dataclasses.dataclass
 class AltTreeEdge:
     """An edge between alt tree nodes."""
+    __slots__ = ('node', 'edge')
+
     node: 'AltTreeNode'  # Destination node.
     edge: 'CompressedEdge'
 
@@ -22,77 +25,136 @@ class AltTreePruneResult:
     pruned_path_regions: 'RegionPath'  # Inner-outer node pairs
 
 
-@dataclasses.dataclass
 class AltTreeNode:
     """A combined inner/outer node pair from an alternating tree."""
 
-    # A shrinking region in the alternating tree.
-    # None if this node is the root.
-    inner_region: Optional['GraphFillRegion']
-    # A growing region in the alternating tree.
-    outer_region: 'GraphFillRegion'
-    # The parent of this region (its outer region is tightly linked to this node's inner region).
-    # None if this node is the root.
-    parent: Optional['AltTreeEdge'] = None
-    # The children of this region (the inner regions of the children are tightly linked to this node's outer region).
-    children: List['AltTreeEdge'] = dataclasses.field(default_factory=list)
-    # The edge from the inner_region to the outer_region.
-    inner_outer_edge: Optional[CompressedEdge] = None
+    __slots__ = (
+        'inner_region',
+        'outer_region',
+        'parent',
+        'children',
+        'inner_outer_edge',
+        'tree_id',
+    )
+
+    def __init__(
+        self,
+        *,
+        inner_region: Optional['GraphFillRegion'],
+        outer_region: 'GraphFillRegion',
+        parent: Optional['AltTreeEdge'] = None,
+        children: Optional[List['AltTreeEdge']] = None,
+        inner_outer_edge: Optional[CompressedEdge] = None,
+        tree_id: Optional[object] = None
+    ):
+        # A shrinking region in the alternating tree.
+        # None if this node is the root.
+        self.inner_region = inner_region
+        # A growing region in the alternating tree.
+        self.outer_region = outer_region
+        # The parent of this region (its outer region is tightly linked to this node's inner region).
+        # None if this node is the root.
+        self.parent = parent
+        # The children of this region (the inner regions of the children are tightly linked to this node's outer
+        # region).
+        self.children: List['AltTreeEdge'] = [] if children is None else children
+        # The edge from the inner_region to the outer_region.
+        self.inner_outer_edge = inner_outer_edge
+        # Token shared by every node in the same tree. Trees never merge (colliding trees dissolve into matches) and
+        # subtrees detached while restructuring are always reattached to the same tree, so this rarely changes.
+        self.tree_id: object = object() if tree_id is None else tree_id
+
+    def __repr__(self) -> str:
+        return (f'AltTreeNode(inner_region={self.inner_region!r}, '
+                f'outer_region={self.outer_region!r}, '
+                f'inner_outer_edge={self.inner_outer_edge!r}, '
+                f'children=<{len(self.children)} children>)')
 
     def shatter_into_matches(
-            self, *, out: Optional[List[Tuple['GraphFillRegion', 'GraphFillRegion']]] = None,
-            recursion_depth: int = 0
-            ) -> List['GraphFillRegion']:
-        """Turns each node into a match, disassembling the tree in the process."""
-        if out is None:
-            out = []
-        if self.inner_region is not None:
-            self.parent = None
-            self.inner_region.add_match(
-                match=self.outer_region,
-                edge=self.inner_outer_edge
-            )
-            out.append(self.inner_region)
-        for c in self.children:
-            c.node.shatter_into_matches(out=out, recursion_depth=recursion_depth + 1)
-        self.children = []
-        return out
+            self,
+            growth_updates: Optional[List[Tuple['GraphFillRegion', int]]] = None
+    ) -> List['GraphFillRegion']:
+        """Turns each node into a match, disassembling the tree in the process.
 
-    def _as_tuple_for_equality(self) -> Tuple[
+        Returns the inner region of each newly created match, in pre-order. When `growth_updates` is given, a zero
+        growth for both regions of each new match is appended to it, so they can be frozen without a second walk.
+        """
+        matched = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.inner_region is not None:
+                node.parent = None
+                node.inner_region.add_match(
+                    match=node.outer_region,
+                    edge=node.inner_outer_edge
+                )
+                matched.append(node.inner_region)
+                if growth_updates is not None:
+                    growth_updates.append((node.inner_region, 0))
+                    growth_updates.append((node.outer_region, 0))
+            stack.extend(c.node for c in reversed(node.children))
+            node.children = []
+        return matched
+
+    def _iter_equality_entries(self) -> Iterator[
         Tuple[
-            Tuple[Optional[int], Optional[int]],
-            Tuple[Optional[int], Optional[int]],
-        ],
-        Tuple[Any, ...],
+            Tuple[Tuple[Optional[int], Optional[int]], Tuple[Optional[int], Optional[int]]],
+            int,
+        ]
     ]:
-        if self.inner_region is None:
-            this_node = ((None, None), (self.outer_region.id, None))
-        else:
-            this_node = ((self.inner_region.id, self.inner_outer_edge.loc_from.loc),
-                         (self.outer_region.id, self.inner_outer_edge.loc_to.loc))
-        return this_node, tuple(c.node._as_tuple_for_equality() for c in self.children)
+        """Yields the subtree's nodes in pre-order as (node, number of children) entries, which determine its shape.
+
+        Uses an explicit stack, so deep trees don't hit the recursion limit.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.inner_region is None:
+                this_node = ((None, None), (node.outer_region.id, None))
+            else:
+                this_node = ((node.inner_region.id, node.inner_outer_edge.loc_from.loc),
+                             (node.outer_region.id, node.inner_outer_edge.loc_to.loc))
+            yield this_node, len(node.children)
+            stack.extend(c.node for c in reversed(node.children))
+
+    def _as_tuple_for_equality(self) -> Tuple[Any, ...]:
+        return tuple(self._iter_equality_entries())
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, type(self)):
             return NotImplemented
+        if self is other:
+            return True
         if self.inner_region != other.inner_region or self.outer_region != other.outer_region:
             return False
-        return self.find_root()._as_tuple_for_equality() == other.find_root()._as_tuple_for_equality()
+        # Compare lazily, stopping at the first difference instead of flattening both trees up front.
+        missing = object()
+        entries1 = self.find_root()._iter_equality_entries()
+        entries2 = other.find_root()._iter_equality_entries()
+        return all(a == b for a, b in itertools.zip_longest(entries1, entries2, fillvalue=missing))
 
     def __ne__(self, other: Any) -> bool:
         return not self == other
 
-    def ancestors(self, *, stop_before: Optional['AltTreeNode'] = None) -> List['AltTreeNode']:
-        """Lists the node and its ancestors, in child-first order."""
+    def iter_ancestors(self, *, stop_before: Optional['AltTreeNode'] = None) -> Iterator['AltTreeNode']:
+        """Yields the node and its ancestors, in child-first order.
+
+        Each node's parent is read before the node is yielded, so callers may detach yielded nodes as they go.
+        """
         if self is stop_before:
-            return []
-        result = [self]
+            return
+        node = self
         while True:
-            current_node = result[-1]
-            if current_node.inner_region is None or current_node.parent.node is stop_before:
-                break
-            result.append(current_node.parent.node)
-        return result
+            next_node = None if node.inner_region is None else node.parent.node
+            yield node
+            if next_node is None or next_node is stop_before:
+                return
+            node = next_node
+
+    def ancestors(self, *, stop_before: Optional['AltTreeNode'] = None) -> List['AltTreeNode']:
+        """Lists the node and its ancestors, in child-first order."""
+        return list(self.iter_ancestors(stop_before=stop_before))
 
     def become_root(self) -> None:
         """Performs a tree rotation turning this node into the root of the tree."""
@@ -100,21 +162,24 @@ class AltTreeNode:
             # Already the root.
             assert self.parent is None
             return
-        assert self.parent is not None
-        old_parent = self.parent.node
-        old_parent.become_root()
-        assert self.parent.node.inner_region is None
-        self.parent.node.inner_region = self.inner_region
-        self.parent.node.inner_outer_edge = self.parent.edge
-        self.inner_region = None
-        self.parent.node.children = [e for e in self.parent.node.children if e.node is not self]
-        self.parent = None
-        self.add_child(
-            AltTreeEdge(
-                node=old_parent,
-                edge=self.inner_outer_edge
+        # Rotate the root down the path towards this node, one edge at a time.
+        path = self.ancestors()
+        for k in range(len(path) - 2, -1, -1):
+            node = path[k]
+            assert node.parent is not None
+            old_parent = node.parent.node
+            assert old_parent.inner_region is None
+            old_parent.inner_region = node.inner_region
+            old_parent.inner_outer_edge = node.parent.edge
+            node.inner_region = None
+            old_parent.remove_child(node)
+            node.parent = None
+            node.add_child(
+                AltTreeEdge(
+                    node=old_parent,
+                    edge=node.inner_outer_edge
+                )
             )
-        )
 
     def add_child(self, child: 'AltTreeEdge') -> None:
         self.children.append(child)
@@ -122,11 +187,30 @@ class AltTreeNode:
             node=self,
             edge=child.edge.reversed()
         )
+        if child.node.tree_id is not self.tree_id:
+            # Attaching a subtree from another tree.
+            stack = [child.node]
+            while stack:
+                node = stack.pop()
+                node.tree_id = self.tree_id
+                stack.extend(c.node for c in node.children)
+
+    def remove_child(self, child_node: 'AltTreeNode') -> None:
+        """Removes the edge to the given child node, in place."""
+        children = self.children
+        for k in range(len(children)):
+            if children[k].node is child_node:
+                del children[k]
+                return
+        raise ValueError(f'Not a child: {child_node}')
 
     def validate_parent_child(self) -> None:
-        for c in self.children:
-            assert c.node.parent.node == self
-            c.node.validate_parent_child()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            for c in node.children:
+                assert c.node.parent.node is node
+                stack.append(c.node)
 
     def find_root(self) -> 'AltTreeNode':
         current_node = self
@@ -135,15 +219,20 @@ class AltTreeNode:
         return current_node
 
     def most_recent_common_ancestor(self, other: 'AltTreeNode') -> 'AltTreeNode':
-        seen = set(id(e) for e in self.ancestors())
-        for ancestor in other.ancestors():
-            if id(ancestor) in seen:
-                return ancestor
+        # Both ancestries end at the root; walk them backwards from there until they diverge.
+        path1 = self.ancestors()
+        path2 = other.ancestors()
+        if path1[-1] is path2[-1]:
+            k = -1
+            n = -min(len(path1), len(path2))
+            while k > n and path1[k - 1] is path2[k - 1]:
+                k -= 1
+            return path1[k]
         raise ValueError(f'No common ancestor between ({self.inner_region},{self.outer_region}) '
                          f'and ({self.inner_region},{self.outer_region}).')
 
     def in_same_tree_as(self, other: 'AltTreeNode') -> bool:
-        return self.find_root() is other.find_root()
+        return self.tree_id is other.tree_id
 
     def __str__(self) -> str:
         indent1 = '+---'
@@ -169,7 +258,8 @@ class AltTreeNode:
     ) -> 'AltTreeNode':
         node = AltTreeNode(inner_region=inner_graph_fill_region,
                            outer_region=outer_graph_fill_region,
-                           inner_outer_edge=inner_outer_edge
+                           inner_outer_edge=inner_outer_edge,
+                           tree_id=self.tree_id
                            )
         inner_graph_fill_region.alt_tree_node = node
         outer_graph_fill_region.alt_tree_node = node
@@ -199,7 +289,7 @@ class AltTreeNode:
         """
         orphans = []
         removed_regions = []
-        for node in self.ancestors(stop_before=prune_parent):
+        for node in self.iter_ancestors(stop_before=prune_parent):
             for child in node.children:
                 orphans.append(child)
                 child.node.parent = None
@@ -218,7 +308,7 @@ class AltTreeNode:
                         edge=node.parent.edge
                     )
                 )
-                node.parent.node.children = [c for c in node.parent.node.children if c.node is not node]
+                node.parent.node.remove_child(node)
                 node.parent = None
                 node.inner_region.alt_tree_node = None
         return AltTreePruneResult(orphans=orphans, pruned_path_regions=RegionPath(removed_regions))
@@ -107,6 +107,58 @@ def test_find_root():
     assert tree.children[1].node.find_root() is tree
 
 
+def test_in_same_tree_as():
+    t = alternating_tree_builder()
+    tree = t(t(t(), t(), t(), ), t(), root=True)
+    other = t(t(), root=True)
+    nodes = [tree, tree.children[0].node, tree.children[0].node.children[2].node, tree.children[1].node]
+
+    for a in nodes:
+        for b in nodes:
+            assert a.in_same_tree_as(b)
+        assert not a.in_same_tree_as(other)
+        assert not a.in_same_tree_as(other.children[0].node)
+
+    grandchild = tree.children[1].node.make_child_inner_outer(
+        inner_graph_fill_region=GraphFillRegion(id=100),
+        outer_graph_fill_region=GraphFillRegion(id=101),
+        inner_outer_edge=CompressedEdge(loc_from=DetectorNode(loc=100), loc_to=DetectorNode(loc=101),
+                                        obs_mask=0, distance=1),
+        child_edge=CompressedEdge(loc_from=DetectorNode(loc=3), loc_to=DetectorNode(loc=100),
+                                  obs_mask=0, distance=1)
+    )
+    assert grandchild.in_same_tree_as(tree)
+    assert not grandchild.in_same_tree_as(other)
+
+
+def test_shatter_into_matches():
+    t = alternating_tree_builder()
+    tree = t(t(t(), t(), ), t(), root=True)
+    growth_updates = []
+    matched = tree.shatter_into_matches(growth_updates)
+
+    # Pre-order: the first child, its children, then the second child.
+    assert [r.id for r in matched] == [4, 0, 2, 6]
+    for r in matched:
+        assert r.match.region.id == r.id + 1
+        assert r.match.region.match.region is r
+        assert r.alt_tree_node is None
+    assert growth_updates == [(region, 0) for r in matched for region in (r, r.match.region)]
+    assert tree.children == []
+
+
+def test_remove_child():
+    t = alternating_tree_builder()
+    tree = t(t(), t(), t(), root=True)
+    a, b, c = [e.node for e in tree.children]
+    tree.remove_child(b)
+    assert len(tree.children) == 2
+    assert tree.children[0].node is a
+    assert tree.children[1].node is c
+    with pytest.raises(ValueError):
+        tree.remove_child(b)
+
+
 def test_alt_tree_node_equality():
     eq = cirq.testing.EqualsTester()
 
@@ -124,6 +176,35 @@ def test_alt_tree_node_equality():
     eq.add_equality_group(tree1.children[1].node, tree2.children[1].node)
     eq.add_equality_group(tree3)
 
+    # Same nodes in a different shape.
+    t = alternating_tree_builder()
+    chain = t(t(t(inner_id=3, outer_id=4), inner_id=1, outer_id=2), outer_id=0, root=True)
+    fork = t(t(inner_id=1, outer_id=2), t(inner_id=3, outer_id=4), outer_id=0, root=True)
+    assert chain != fork
+
+
+def chain_tree(depth: int) -> AltTreeNode:
+    root = AltTreeNode(inner_region=None, outer_region=GraphFillRegion(id=0))
+    node = root
+    for k in range(1, 2 * depth, 2):
+        node = node.make_child_inner_outer(
+            inner_graph_fill_region=GraphFillRegion(id=k),
+            outer_graph_fill_region=GraphFillRegion(id=k + 1),
+            inner_outer_edge=CompressedEdge(
+                loc_from=DetectorNode(loc=k), loc_to=DetectorNode(loc=k + 1), obs_mask=0, distance=1
+            ),
+            child_edge=CompressedEdge(
+                loc_from=DetectorNode(loc=k - 1), loc_to=DetectorNode(loc=k), obs_mask=0, distance=1
+            ),
+        )
+    return root
+
+
+def test_alt_tree_node_equality_deep_tree():
+    # Deeper than the default recursion limit.
+    assert chain_tree(2000) == chain_tree(2000)
+    assert chain_tree(2000) != chain_tree(1999)
+
 
 def test_alt_tree_most_recent_common_ancestor():
     t = alternating_tree_builder()
@@ -174,6 +255,27 @@ def test_become_root():
     )
 
 
+def test_become_root_deep_tree():
+    root = chain_tree(2000)
+    leaf = root
+    while leaf.children:
+        leaf = leaf.children[0].node
+    leaf.become_root()
+    assert leaf.parent is None
+    assert leaf.inner_region is None
+    assert root.find_root() is leaf
+    assert not root.children
+    depth = 0
+    node = leaf
+    while node.children:
+        assert len(node.children) == 1
+        assert node.children[0].node.parent.node is node
+        node = node.children[0].node
+        depth += 1
+    assert node is root
+    assert depth == 2000
+
+
 def test_alt_tree_outer_ancestry():
     t = alternating_tree_builder()
     tree = t(
@@ -53,6 +53,9 @@ class TentativeEvent(Generic[TLocation]):
     time: float
     event_id: int
 
+    # Type tag used by the flooder to dispatch events without isinstance checks.
+    KIND = -1
+
     @property
     @abc.abstractmethod
     def is_invalidated(self):
@@ -63,13 +66,18 @@ class TentativeEvent(Generic[TLocation]):
         pass
 
     def __lt__(self, other):
+        """Orders by time, then by event_id, so simultaneous events come out in the order they were scheduled."""
         if not isinstance(other, TentativeEvent):
             return NotImplemented
-        return self.time < other.time
+        if self.time != other.time:
+            return self.time < other.time
+        return self.event_id < other.event_id
 
 
 @dataclasses.dataclass
 class TentativeNeighborInteractionEvent(TentativeEvent):
+    KIND = 0
+
     location_data_1: 'DetectorNode'
     schedule_list_index_1: int
     location_data_2: Optional['DetectorNode']
@@ -92,6 +100,8 @@ class TentativeNeighborInteractionEvent(TentativeEvent):
 
 @dataclasses.dataclass
 class TentativeRegionShrinkEvent(TentativeEvent):
+    KIND = 1
+
     region: 'GraphFillRegion'
     is_invalidated: bool = False
 
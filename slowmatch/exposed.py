@@ -1,6 +1,6 @@
 import dataclasses
 import math
-from typing import List, Callable, Union, Set, Any
+from typing import List, Callable, Union, Set, Any, Iterable, Tuple
 
 import networkx as nx
 import numpy as np
@@ -68,7 +68,9 @@ class Matching:
         self.flooder = GraphFlooder(self.graph, enable_logger=enable_logger)
         self.mwpm = Mwpm(self.flooder)
 
-    def decode_from_event_locations(self, detection_events: List[Union[int, complex]]) -> MatchingResult:
+    def _match_event_locations(
+            self, detection_events: Iterable[Union[int, complex]]
+    ) -> Tuple[List[CompressedEdge], int, int]:
         # Add detection events
         for d in detection_events:
             self.mwpm.add_detection_event(d)
@@ -81,19 +83,42 @@ class Matching:
             self.mwpm.process_event(event)
 
         # Shatter blossoms to extract matching and cleanup Mwpm object for next cycle
-        match_edges, total_weight, obs_mask = self.mwpm.extract_matching_and_reset_graph()
-        obs_array = int_to_binary_array(obs_mask, self.num_observables)
+        result = self.mwpm.extract_matching_and_reset_graph()
         self.mwpm.reset()
+        return result
+
+    def decode_from_event_locations(self, detection_events: List[Union[int, complex]]) -> MatchingResult:
+        match_edges, total_weight, obs_mask = self._match_event_locations(detection_events)
         return MatchingResult(
             match_edges=match_edges,
             total_weight=total_weight,
-            predicted_observables=obs_array
+            predicted_observables=int_to_binary_array(obs_mask, self.num_observables)
         )
 
     def decode(self, syndrome) -> MatchingResult:
         detection_events = syndrome.nonzero()[0]
         return self.decode_from_event_locations(detection_events=detection_events)
 
+    def decode_batch(self, shots: np.ndarray, *, bit_packed: bool = False) -> np.ndarray:
+        """Decodes each row of `shots`, returning a (num_shots, num_observables) boolean array of predictions.
+
+        Rows are syndromes as accepted by `decode`, or stim's bit packed samples (little endian bits in uint8 bytes)
+        if `bit_packed` is set. Only the observable masks are kept per shot; they are expanded into bits all at once.
+        """
+        num_shots = shots.shape[0]
+        match = self._match_event_locations
+        obs_masks = []
+        for k in range(num_shots):
+            # Stim zeroes the padding bits of packed rows, so they never become detection events.
+            shot = np.unpackbits(shots[k], bitorder='little') if bit_packed else shots[k]
+            _, _, obs_mask = match(np.flatnonzero(shot))
+            obs_masks.append(obs_mask)
+        if self.num_observables > 63:
+            return np.array([int_to_binary_array(m, self.num_observables) for m in obs_masks],
+                            dtype=np.bool_).reshape(num_shots, self.num_observables)
+        obs_masks = np.array(obs_masks, dtype=np.uint64).reshape(num_shots, 1)
+        return ((obs_masks >> np.arange(self.num_observables, dtype=np.uint64)) & np.uint64(1)).astype(np.bool_)
+
 
 def int_to_binary_array(n: int, num_bits: int) -> np.ndarray:
     obs_list = [int(i) for i in bin(n)[:1:-1]]
@@ -159,11 +159,12 @@ def plausible_case(width: int, height: int, p: float = ERROR_RATE):
 
 def test_complex_grid():
     random.seed(3)
+    # The graph only depends on the grid, so build it (and the matcher reusing it) once for all cases.
+    graph = graph_from_neighbors_and_boundary(1 + 1j, complex_grid_neighbors,
+                                              complex_grid_is_on_boundary)
+    matching = Matching(model=graph)
     for i in range(20):
         locs = plausible_case(WIDTH, HEIGHT)
-        graph = graph_from_neighbors_and_boundary(1 + 1j, complex_grid_neighbors,
-                                                  complex_grid_is_on_boundary)
-        matching = Matching(model=graph)
         res = matching.decode_from_event_locations(locs)
         match_locs = set()
         for e in res.match_edges:
@@ -205,3 +206,17 @@ def test_slowmatch_vs_pymatching(d: int, noise: float, seed: int, num_shots: int
         res = matching_graph.decode(expanded_det)
         pm_prediction, pm_weight = pymatching_graph.decode(expanded_det, return_weight=True, num_neighbours=None)
         assert pm_weight == res.total_weight
+
+
+def test_decode_batch_matches_decode():
+    circuit = stim.Circuit.generated(
+        "repetition_code:memory",
+        rounds=5,
+        distance=5,
+        before_round_data_depolarization=0.1)
+    shots = circuit.compile_detector_sampler(seed=0).sample(50)
+    matching = Matching(circuit.detector_error_model(decompose_errors=True))
+    expected = np.array([matching.decode(shot).predicted_observables for shot in shots], dtype=np.bool_)
+    np.testing.assert_array_equal(matching.decode_batch(shots), expected)
+    packed_shots = np.packbits(shots, axis=1, bitorder='little')
+    np.testing.assert_array_equal(matching.decode_batch(packed_shots, bit_packed=True), expected)
@@ -94,6 +94,21 @@ class DetectorNode(Generic[TLocation]):
     correspond to physical errors.
     """
 
+    __slots__ = (
+        'loc',
+        'observables_crossed',
+        'reached_from_source',
+        'distance_from_source',
+        'region_that_arrived',
+        'neighbors',
+        'neighbor_distances',
+        'neighbor_observables',
+        'neighbor_schedule_list',
+        'neighbor_back_index',
+        'distance_from_search_source',
+        'search_predecessor',
+    )
+
     def __init__(self, loc: TLocation) -> None:
         self.loc = loc
         self.observables_crossed: int = 0
@@ -121,11 +136,6 @@ class DetectorNode(Generic[TLocation]):
     def num_neighbors(self) -> int:
         return len(self.neighbors)
 
-    def has_same_owner_as(self, other: 'DetectorNode') -> bool:
-        if not self.region_that_arrived or not other.region_that_arrived:
-            return False
-        return self.top_region() is other.top_region()
-
     def is_owned_by(self, region: 'GraphFillRegion') -> bool:
         if self.region_that_arrived is None:
             return False
@@ -147,20 +157,37 @@ class DetectorNode(Generic[TLocation]):
         assert curr_region is region
         return radius
 
-    def invalidate_involved_schedule_items(self):
+    def invalidate_involved_schedule_items(self) -> int:
+        """Invalidates the events scheduled on this node's edges, returning how many there were."""
+        num_invalidated = 0
         for e in self.neighbor_schedule_list:
             if e is not None:
                 e.invalidate()
+                num_invalidated += 1
+        return num_invalidated
 
     def local_radius(self) -> Varying:
         if self.region_that_arrived is not None:
             return self.total_radius() - self.distance_from_source
-        return Varying(0)
+        return Varying.ZERO
+
+    def local_radius_slope_and_value(self, time: float) -> Tuple[float, float]:
+        """Returns `(local_radius().slope, local_radius()(time))` without allocating intermediate `Varying`s."""
+        if self.region_that_arrived is None:
+            return 0.0, 0.0
+        cur_region = self.reached_from_source.region_that_arrived
+        slope = cur_region.radius.slope
+        value = cur_region.radius(time)
+        while cur_region.blossom_parent is not None:
+            cur_region = cur_region.blossom_parent
+            slope += cur_region.radius.slope
+            value += cur_region.radius(time)
+        return slope, value - self.distance_from_source
 
     def total_radius(self) -> Varying:
         src = self.reached_from_source
         if not src:
-            return Varying(0)
+            return Varying.ZERO
         cur_region = src.region_that_arrived
         tot_rad = cur_region.radius
         while cur_region.blossom_parent is not None:
@@ -24,6 +24,18 @@ class Match:
 
 @cirq.value_equality(unhashable=True)
 class GraphFillRegion(Generic[TLocation]):
+    __slots__ = (
+        'id',
+        'source',
+        'shell_area',
+        'radius',
+        'blossom_children',
+        'alt_tree_node',
+        'blossom_parent',
+        'shrink_event',
+        'match',
+    )
+
     def __init__(
         self,
         *,
@@ -37,7 +49,7 @@ class GraphFillRegion(Generic[TLocation]):
         self.id = id
         self.source = source
         self.shell_area: List['DetectorNode'] = []
-        self.radius = Varying(radius)
+        self.radius = radius if isinstance(radius, Varying) else Varying(radius)
         self.blossom_children: Optional['RegionPath'] = (
             RegionPath() if blossom_children is None else blossom_children
         )
@@ -69,10 +81,15 @@ class GraphFillRegion(Generic[TLocation]):
     def matched_to_region(self) -> bool:
         return self.match is not None and self.match.region is not None
 
-    def invalidate_involved_schedule_items(self) -> None:
+    def invalidate_involved_schedule_items(self) -> int:
+        """Invalidates the region's pending shrink event, returning how many events were invalidated."""
+        num_invalidated = 0
         if self.shrink_event is not None:
+            if not self.shrink_event.is_invalidated:
+                num_invalidated = 1
             self.shrink_event.invalidate()
             self.shrink_event = None
+        return num_invalidated
 
     def iter_all_sources(self) -> Iterator['DetectorNode']:
         if self.source is not None:
@@ -146,8 +163,8 @@ class GraphFillRegion(Generic[TLocation]):
             return [self]
         this_region = self
         match_region = self.match.region
-        children_here = bool(this_region.blossom_children)
-        children_there = match_region is not None and match_region.blossom_children
+        children_here = bool(this_region.blossom_children.edges)
+        children_there = match_region is not None and bool(match_region.blossom_children.edges)
         if not children_here and not children_there:
             this_region.cleanup_shell_area()
             if this_region.match.region is not None:
@@ -4,6 +4,8 @@ from typing import (
     List,
     Generic,
     Optional,
+    Tuple,
+    Union,
     TYPE_CHECKING
 )
 
@@ -23,6 +25,19 @@ if TYPE_CHECKING:
 
 TLocation = TypeVar('TLocation')
 
+_KIND_NEIGHBOR = TentativeNeighborInteractionEvent.KIND
+_KIND_SHRINK = TentativeRegionShrinkEvent.KIND
+
+
+def _time_of_zero_crossing(now: float, remaining: float, rate: float) -> float:
+    """Returns when a quantity equal to `remaining` at time `now`, decreasing by `rate` per unit time, hits zero."""
+    # Growth slopes are almost always -1, 0 or +1, so combined rates are almost always 1 or 2.
+    if rate == 1:
+        return now + remaining
+    if rate == 2:
+        return now + remaining * 0.5
+    return now + remaining / rate
+
 
 def flooder_from_networkx(graph: nx.Graph) -> 'GraphFlooder':
     new_graph = graph_from_networkx(graph)
@@ -30,6 +45,18 @@ def flooder_from_networkx(graph: nx.Graph) -> 'GraphFlooder':
 
 
 class GraphFlooder(Generic[TLocation]):
+    __slots__ = (
+        'graph',
+        'enable_logger',
+        'time',
+        '_next_event_id',
+        '_next_region_id',
+        '_sorted_schedule',
+        '_invalidated_count',
+        '_push_batch',
+        'logger',
+    )
+
     def __init__(
         self,
         graph: Graph,
@@ -40,43 +67,61 @@ class GraphFlooder(Generic[TLocation]):
         self.time = 0
         self._next_event_id = 0
         self._next_region_id = 0
-        self._sorted_schedule: List[TentativeEvent] = []
+        # Heap of (time, event_id, event) entries. Keying on plain numbers keeps comparisons inside heapq's C code.
+        self._sorted_schedule: List[Tuple[float, int, TentativeEvent]] = []
+        # Number of invalidated events still sitting in `_sorted_schedule`.
+        self._invalidated_count = 0
+        # Event objects that have left the schedule, kept for reuse instead of reallocating.
+        # When not None, newly scheduled neighbor events are collected here instead of pushed one by one.
+        self._push_batch: Optional[List[Tuple[float, int, TentativeEvent]]] = None
         self.logger = Logger(enabled=self.enable_logger)
 
     def reset(self):
         self.time = 0
         self._next_event_id = 0
         self._next_region_id = 0
-        self._sorted_schedule: List[TentativeEvent] = []
+        self._sorted_schedule: List[Tuple[float, int, TentativeEvent]] = []
+        self._invalidated_count = 0
 
-    def create_region(self, location: TLocation) -> GraphFillRegion:
+    def create_region(self, location: Union[TLocation, DetectorNode]) -> GraphFillRegion:
+        """Creates a region growing from the given location key, or directly from its DetectorNode."""
         if self.logger.enabled:
             self.logger.log_region_created()
         k = self._next_region_id
         self._next_region_id += 1
-        location_data = self.graph.nodes[location]
+        if isinstance(location, DetectorNode):
+            location_data = location
+        else:
+            location_data = self.graph.nodes[location]
         new_region = GraphFillRegion(id=k, source=location_data)
         self._do_region_arriving_at_empty_location(region=new_region, location_data=location_data)
         return new_region
 
     def next_event(self, max_time: float = float('inf')) -> Optional[MwpmEvent]:
+        if len(self._sorted_schedule) > 64 and self._invalidated_count > len(self._sorted_schedule) // 2:
+            self._compact_schedule()
+
         # Process events until interaction is needed or no more work can be done.
-        while self._sorted_schedule and self._sorted_schedule[0].time <= max_time:
+        schedule = self._sorted_schedule
+        heappop = heapq.heappop
+        while schedule and schedule[0][0] <= max_time:
             # Get next valid event.
-            tentative_event: TentativeEvent = heapq.heappop(self._sorted_schedule)
+            tentative_event: TentativeEvent = heappop(schedule)[2]
             if tentative_event.is_invalidated:
+                self._invalidated_count -= 1
                 continue
             else:
                 tentative_event.invalidate()
 
             # Apply transformations based on the event.
             self.time = tentative_event.time
-            if isinstance(tentative_event, TentativeNeighborInteractionEvent):
+            kind = tentative_event.KIND
+            if kind == _KIND_NEIGHBOR:
                 if tentative_event.location_data_2 is not None:
                     mwpm_event = self._do_neighbor_interaction(event=tentative_event)
                 else:
                     mwpm_event = self._do_region_hit_boundary_interaction(event=tentative_event)
-            elif isinstance(tentative_event, TentativeRegionShrinkEvent):
+            elif kind == _KIND_SHRINK:
                 mwpm_event = self._do_region_shrinking(event=tentative_event)
             else:
                 raise NotImplementedError(f'Unrecognized event: {tentative_event}')
@@ -88,12 +133,31 @@ class GraphFlooder(Generic[TLocation]):
         # Nothing more to do right now.
         return None
 
+    def _compact_schedule(self) -> None:
+        """Drops invalidated events from the schedule, so they stop slowing down heap operations."""
+        self._sorted_schedule = [entry for entry in self._sorted_schedule if not entry[2].is_invalidated]
+        heapq.heapify(self._sorted_schedule)
+        self._invalidated_count = 0
+
+    def invalidate_events_at_location(self, location_data: 'DetectorNode') -> None:
+        self._invalidated_count += location_data.invalidate_involved_schedule_items()
+
     def has_valid_events_queued(self) -> bool:
-        return any(not e.is_invalidated for e in self._sorted_schedule)
+        return len(self._sorted_schedule) > self._invalidated_count
 
     def set_region_growth(self, region: GraphFillRegion, *, new_growth: int) -> None:
-        region.radius = region.radius.then_slope_at(time_of_change=self.time, new_slope=new_growth)
-        self._reschedule_events_for_region(region)
+        """Changes the growth of one region. Forwards to `set_region_growths`; don't override this."""
+        self.set_region_growths([(region, new_growth)])
+
+    def set_region_growths(self, updates: List[Tuple[GraphFillRegion, int]]) -> None:
+        """Changes the growth of several regions, pushing all of their rescheduled events as one batch.
+
+        This is the only place region growth changes, and the method subclasses override to observe or alter them.
+        """
+        now = self.time
+        for region, new_growth in updates:
+            region.radius = region.radius.then_slope_at(time_of_change=now, new_slope=new_growth)
+        self._reschedule_events_for_regions([region for region, _ in updates])
 
     def create_blossom(self, contained_regions: 'RegionPath') -> GraphFillRegion:
         if self.logger.enabled:
@@ -103,20 +167,21 @@ class GraphFlooder(Generic[TLocation]):
         self._next_region_id += 1
         blossom_region = GraphFillRegion(id=k)
         blossom_region.radius = Varying(base_time=self.time, slope=1)
-        blossom_region.blossom_children = RegionPath()
+        blossom_region.blossom_children = RegionPath(list(contained_regions.edges))
 
+        time = self.time
         for blossom_edge in contained_regions:
-            blossom_region.blossom_children.edges.append(blossom_edge)
-            blossom_edge.region.radius = blossom_edge.region.radius.then_slope_at(time_of_change=self.time, new_slope=0)
-            blossom_edge.region.blossom_parent = blossom_region
-            blossom_edge.region.alt_tree_node = None
+            child = blossom_edge.region
+            child.radius = child.radius.then_slope_at(time_of_change=time, new_slope=0)
+            child.blossom_parent = blossom_region
+            child.alt_tree_node = None
 
-        self._reschedule_events_for_region(blossom_region)
+        self._reschedule_events_for_regions([blossom_region])
 
         # Rescheduling the blossom region fixed location schedules, but not
         # child region schedules. Fix them now.
         for child in blossom_region.blossom_children:
-            child.region.invalidate_involved_schedule_items()
+            self._invalidated_count += child.region.invalidate_involved_schedule_items()
 
         return blossom_region
 
@@ -125,6 +190,9 @@ class GraphFlooder(Generic[TLocation]):
             location_data_2: Optional[DetectorNode], schedule_list_index_2: Optional[int],
             time: float
     ):
+        # Callers invalidate the edge's previous event before rescheduling, because its time was computed from
+        # slopes that may no longer hold. So there is never an existing event to keep instead of this one.
+        assert location_data_1.neighbor_schedule_list[schedule_list_index_1] is None
         tentative_event = TentativeNeighborInteractionEvent(
             time=time, event_id=self._next_event_id,
             location_data_1=location_data_1,
@@ -136,65 +204,98 @@ class GraphFlooder(Generic[TLocation]):
         location_data_1.neighbor_schedule_list[schedule_list_index_1] = tentative_event
         if location_data_2 is not None:
             location_data_2.neighbor_schedule_list[schedule_list_index_2] = tentative_event
-        heapq.heappush(self._sorted_schedule, tentative_event)
+        entry = (time, tentative_event.event_id, tentative_event)
+        if self._push_batch is not None:
+            self._push_batch.append(entry)
+        else:
+            heapq.heappush(self._sorted_schedule, entry)
         assert time >= self.time
 
     def _schedule_tentative_shrink_event(
             self, region: GraphFillRegion
     ) -> None:
         if not region.shell_area:
-            time = region.radius.zero_intercept()  # Blossom implosion
+            rad = region.radius  # Blossom implosion
         else:
-            time = region.shell_area[-1].local_radius().zero_intercept()  # Leave event, or degenerate implosion
+            rad = region.shell_area[-1].local_radius()  # Leave event, or degenerate implosion
+        time = _time_of_zero_crossing(self.time, rad(self.time), -rad.slope)
         tentative_event = TentativeRegionShrinkEvent(time=time, event_id=self._next_event_id, region=region)
         self._next_event_id += 1
         region.shrink_event = tentative_event
-        heapq.heappush(self._sorted_schedule, tentative_event)
+        heapq.heappush(self._sorted_schedule, (time, tentative_event.event_id, tentative_event))
         assert time >= self.time
 
     def _reschedule_events_for_region(self, region: 'GraphFillRegion') -> None:
-        region.invalidate_involved_schedule_items()
+        self._invalidated_count += region.invalidate_involved_schedule_items()
         if self.logger.enabled:
             self.logger.log_area_set(region.total_area_size())
         if region.radius.slope < 0:
             self._schedule_tentative_shrink_event(region)
             for location_data in region.iter_total_area():
-                location_data.invalidate_involved_schedule_items()
+                self.invalidate_events_at_location(location_data)
         else:
+            # Frozen regions (slope 0) still need their events recomputed: growing neighbors can collide with them,
+            # and the events invalidated above are the only record of those collisions.
+            if len(region.shell_area) == 1 and not region.blossom_children.edges:
+                # Common case of a lone detection event's region; skip the generator.
+                self.reschedule_events_at_location(location_data=region.shell_area[0])
+                return
             for location_data in region.iter_total_area():
                 self.reschedule_events_at_location(location_data=location_data)
 
-    def reschedule_events_at_location(self, *, location_data: 'DetectorNode') -> None:
-        location_data.invalidate_involved_schedule_items()
+    def _reschedule_events_for_regions(self, regions: List[GraphFillRegion]) -> None:
+        """Reschedules the events of several regions, pushing all of them onto the schedule as one batch."""
+        batch = self._push_batch = []
+        try:
+            for region in regions:
+                self._reschedule_events_for_region(region)
+        finally:
+            # Always leave batching mode, so a failure can't strand later events in a dead batch.
+            self._push_batch = None
+        self._push_entries(batch)
+
+    def _push_entries(self, entries: List[Tuple[float, int, TentativeEvent]]) -> None:
+        """Adds several schedule entries, rebuilding the heap only when that beats pushing them one at a time."""
+        if len(entries) > len(self._sorted_schedule):
+            self._sorted_schedule.extend(entries)
+            heapq.heapify(self._sorted_schedule)
+        else:
+            for entry in entries:
+                heapq.heappush(self._sorted_schedule, entry)
 
-        rad1 = location_data.local_radius()
-        for i in range(location_data.num_neighbors):
-            distance = location_data.neighbor_distances[i]
-            neighbor_location_data = location_data.neighbors[i]
+    def reschedule_events_at_location(self, *, location_data: 'DetectorNode') -> None:
+        self.invalidate_events_at_location(location_data)
+
+        neighbors = location_data.neighbors
+        distances = location_data.neighbor_distances
+        back_indices = location_data.neighbor_back_index
+        now = self.time
+        slope1, rad1_now = location_data.local_radius_slope_and_value(now)
+        top_region1 = location_data.top_region()
+        for i in range(len(neighbors)):
+            neighbor_location_data = neighbors[i]
             if neighbor_location_data is None:
-                dis_to_boundary = distance - rad1
-                if dis_to_boundary.slope < 0:
+                if slope1 > 0:
                     self._schedule_tentative_neighbor_interaction_event(
                         location_data_1=location_data,
                         schedule_list_index_1=i,
                         location_data_2=None,
                         schedule_list_index_2=None,
-                        time=dis_to_boundary.zero_intercept()
+                        time=_time_of_zero_crossing(now, distances[i] - rad1_now, slope1)
                     )
                 continue
-            if location_data.has_same_owner_as(neighbor_location_data):
-                continue
-            rad2 = neighbor_location_data.local_radius()
-            rad3 = rad1 + rad2 - distance   # Collision time
-            if rad3.slope <= 0:
+            if top_region1 is not None and neighbor_location_data.top_region() is top_region1:
+                continue  # Same owner.
+            slope2, rad2_now = neighbor_location_data.local_radius_slope_and_value(now)
+            collision_rate = slope1 + slope2
+            if collision_rate <= 0:
                 continue
-            j = location_data.neighbor_back_index[i]
             self._schedule_tentative_neighbor_interaction_event(
                 location_data_1=location_data,
                 schedule_list_index_1=i,
                 location_data_2=neighbor_location_data,
-                schedule_list_index_2=j,
-                time=rad3.zero_intercept()
+                schedule_list_index_2=back_indices[i],
+                time=_time_of_zero_crossing(now, distances[i] - rad1_now - rad2_now, collision_rate)
             )
 
     def _do_region_arriving_at_empty_location(
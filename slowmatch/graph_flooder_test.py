@@ -1,9 +1,10 @@
-from typing import Any, Optional, Dict
+import heapq
+from typing import Any, Optional, Dict, List, Tuple
 
 import numpy as np
 import pytest
 
-from slowmatch.graph_flooder import GraphFlooder
+from slowmatch.graph_flooder import GraphFlooder, _time_of_zero_crossing
 from slowmatch.graph import Graph
 from slowmatch.graph_fill_region import GraphFillRegion
 from slowmatch.events import BlossomImplodeEvent, TentativeEvent, RegionHitRegionEvent
@@ -30,10 +31,10 @@ class RecordingFlooder(GraphFlooder):
         self.recorded_commands.append(('create_region', location, result))
         return result
 
-    def set_region_growth(self, region: 'GraphFillRegion', *, new_growth: int):
+    def set_region_growths(self, updates: List[Tuple['GraphFillRegion', int]]) -> None:
         if self.sub_flooder is not None:
-            self.sub_flooder.set_region_growth(region, new_growth=new_growth)
-        self.recorded_commands.append(('set_region_growth', region, new_growth))
+            self.sub_flooder.set_region_growths(updates)
+        self.recorded_commands.extend(('set_region_growth', region, new_growth) for region, new_growth in updates)
 
     def create_blossom(self, contained_regions):
         if self.sub_flooder is None:
@@ -101,6 +102,38 @@ def test_tentative_event():
     with pytest.raises(TypeError):
         _ = a < 5
     assert a < b
+    assert not b < a
+    c = TentativeEvent(time=0, event_id=3)
+    assert a < c
+    assert not c < a
+    assert not a < a
+
+
+def test_time_of_zero_crossing():
+    assert _time_of_zero_crossing(3, 5, 1) == 8
+    assert _time_of_zero_crossing(3, 5, 2) == 5.5
+    assert _time_of_zero_crossing(3, 6, 3) == 5
+    assert _time_of_zero_crossing(3, 0, 1) == 3
+
+
+def test_create_region_from_detector_node():
+    flooder = GraphFlooder(line_graph(0, 5))
+    node = flooder.graph.nodes[2]
+    assert flooder.create_region(node).source is node
+    assert flooder.create_region(4).source is flooder.graph.nodes[4]
+
+
+def test_same_time_fifo():
+    flooder = GraphFlooder(line_graph(0, 5))
+    nodes = flooder.graph.nodes
+    for k in range(4):
+        flooder._schedule_tentative_neighbor_interaction_event(
+            location_data_1=nodes[k], schedule_list_index_1=len(nodes[k].neighbors) - 1,
+            location_data_2=nodes[k + 1], schedule_list_index_2=0,
+            time=7
+        )
+    popped = [heapq.heappop(flooder._sorted_schedule)[2].event_id for _ in range(4)]
+    assert popped == [0, 1, 2, 3]
 
 
 def get_helper_functions_from_fill_system(fill: RecordingFlooder):
@@ -314,3 +347,67 @@ def test_grid_progression():
     while len(points) < 40:
         points.add(rng.randint(0, 50) + 1j * rng.randint(0, 50))
     assert_completes(*points, graph=complex_skew_graph(200 + 200j, -200 - 200j))
+
+
+def test_invalidated_count_tracks_schedule():
+    g = complex_grid_graph(200 + 100j, -100 - 100j)
+    flooder = GraphFlooder(g)
+    mwpm = Mwpm(flooder=flooder)
+    for p in [(75 + 10j), (7 + 10j), (10 + 13j), (13 + 10j), (22 + 25j), (31 + 10j)]:
+        mwpm.add_region(flooder.create_region(p))
+
+    while True:
+        event = flooder.next_event()
+        assert flooder._invalidated_count == sum(e.is_invalidated for _, _, e in flooder._sorted_schedule)
+        if event is None:
+            break
+        mwpm.process_event(event)
+        assert flooder._invalidated_count == sum(e.is_invalidated for _, _, e in flooder._sorted_schedule)
+        assert flooder.has_valid_events_queued() == any(not e.is_invalidated for _, _, e in flooder._sorted_schedule)
+    assert not flooder.has_valid_events_queued()
+
+
+def test_local_radius_slope_and_value_matches_local_radius():
+    g = line_graph(-100, 100)
+    flooder = GraphFlooder(g)
+    mwpm = Mwpm(flooder=flooder)
+    for p in [0, 1, 3, -10, 10]:
+        mwpm.add_region(flooder.create_region(p))
+
+    while True:
+        for node in g.nodes.values():
+            rad = node.local_radius()
+            assert node.local_radius_slope_and_value(flooder.time) == (rad.slope, rad(flooder.time))
+        event = flooder.next_event()
+        if event is None:
+            break
+        mwpm.process_event(event)
+
+
+def test_push_entries_keeps_heap_order():
+    flooder = GraphFlooder(line_graph(0, 5))
+    events = [TentativeEvent(time=t, event_id=k) for k, t in enumerate([5, 3, 8, 1, 3, 9, 0, 2])]
+    flooder._push_entries([(e.time, e.event_id, e) for e in events[:5]])  # Rebuilds the heap.
+    flooder._push_entries([(e.time, e.event_id, e) for e in events[5:]])  # Pushes one at a time.
+    popped = []
+    while flooder._sorted_schedule:
+        popped.append(heapq.heappop(flooder._sorted_schedule)[2])
+    assert popped == sorted(events)
+
+
+def test_set_region_growths_leaves_batching_mode_after_failure(monkeypatch):
+    flooder = GraphFlooder(line_graph(0, 5))
+    region = flooder.create_region(2)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('fail')
+
+    with monkeypatch.context() as m:
+        m.setattr(GraphFlooder, 'reschedule_events_at_location', fail)
+        with pytest.raises(RuntimeError):
+            flooder.set_region_growths([(region, 1)])
+    assert flooder._push_batch is None
+
+    flooder._sorted_schedule.clear()
+    flooder.set_region_growth(region, new_growth=1)
+    assert flooder._sorted_schedule
@@ -1,19 +1,30 @@
+import array
 from collections import Counter
-from typing import List
 
 
 class Logger:
+    __slots__ = (
+        'area_counter',
+        'boundary_counter',
+        'enabled',
+        'event_list',
+        'blossom_created_stats_list',
+        'blossom_implosion_stats_list',
+        'num_regions',
+    )
+
     def __init__(self, enabled: bool = False):
         self.area_counter: Counter = Counter()
         self.boundary_counter: Counter = Counter()
         self.enabled: bool = enabled
-        self.event_list: List[int] = []
+        # Area sizes as native int64s, rather than a list of boxed ints.
+        self.event_list: array.array = array.array('q')
         self.blossom_created_stats_list = []
         self.blossom_implosion_stats_list = []
         self.num_regions = 0
 
     def log_area_set(self, area_size: int):
-        self.area_counter.update([area_size])
+        self.area_counter[area_size] += 1
         self.event_list.append(area_size)
 
     def log_blossom_created(self, blossom_size: int, blossom_depth: int):
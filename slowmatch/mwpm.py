@@ -1,5 +1,5 @@
 import math
-from typing import TypeVar, List, Tuple, TYPE_CHECKING, Iterator
+from typing import TypeVar, List, Tuple, TYPE_CHECKING, Iterator, Dict, Callable, Any
 
 from slowmatch.alternating_tree import AltTreeNode, AltTreeEdge
 from slowmatch.graph_flooder import (GraphFlooder)
@@ -18,12 +18,21 @@ TLocation = TypeVar('TLocation')
 
 
 class Mwpm:
-    """The internal state of an embedded minimum weight perfect matching algorithm."""
+    """The internal state of an embedded minimum weight perfect matching algorithm.
+
+    Growth changes are sent to the flooder through `set_region_growths`, so flooder implementations must provide it.
+    """
 
     def __init__(self, flooder: GraphFlooder):
         self.fill_system: GraphFlooder = flooder
         self.detection_events: List[DetectorNode] = []
         self.match_edges: List['CompressedEdge'] = []
+        # Handler for each event type, looked up by exact type before falling back to isinstance checks.
+        self._event_handlers: Dict[type, Callable[[Any], None]] = {
+            BlossomImplodeEvent: self.handle_blossom_imploding,
+            RegionHitRegionEvent: self.handle_region_hitting_region,
+            RegionHitBoundaryEvent: self.handle_tree_hitting_boundary,
+        }
 
     def add_region(self, region: 'GraphFillRegion'):
         outer_node = AltTreeNode(inner_region=None, outer_region=region)
@@ -31,28 +40,37 @@ class Mwpm:
 
     def add_detection_event(self, node_id: TLocation):
         location_data = self.fill_system.graph.nodes[node_id]
-        region = self.fill_system.create_region(node_id)
+        region = self.fill_system.create_region(location_data)
         self.add_region(region)
         self.detection_events.append(location_data)
 
     def process_event(self, event: MwpmEvent):
-        if isinstance(event, BlossomImplodeEvent):
-            self.handle_blossom_imploding(event)
-        elif isinstance(event, RegionHitRegionEvent):
-            if event.region1.matched_to_region() or event.region2.matched_to_region():
-                self.handle_tree_hitting_match(event)
-            elif (
-                    event.region1.is_matched_to_boundary() or event.region2.is_matched_to_boundary()
-            ):
-                self.handle_tree_hitting_boundary_match(event)
-            elif event.region1.alt_tree_node.in_same_tree_as(event.region2.alt_tree_node):
+        handler = self._event_handlers.get(type(event))
+        if handler is None:
+            # Subclasses of the event types miss the exact-type lookup.
+            for event_type, event_handler in self._event_handlers.items():
+                if isinstance(event, event_type):
+                    handler = event_handler
+                    break
+            else:
+                raise NotImplementedError(f'Unrecognized event type "{type(event)}": {event!r}')
+        handler(event)
+
+    def handle_region_hitting_region(self, event: RegionHitRegionEvent):
+        # Checked in order of how often each case occurs: collisions between two unmatched tree regions dominate.
+        region1 = event.region1
+        region2 = event.region2
+        match1 = region1.match
+        match2 = region2.match
+        if match1 is None and match2 is None:
+            if region1.alt_tree_node.tree_id is region2.alt_tree_node.tree_id:
                 self.handle_tree_hitting_self(event)
             else:
                 self.handle_tree_hitting_other_tree(event)
-        elif isinstance(event, RegionHitBoundaryEvent):
-            self.handle_tree_hitting_boundary(event)
+        elif (match1 is not None and match1.region is not None) or (match2 is not None and match2.region is not None):
+            self.handle_tree_hitting_match(event)
         else:
-            raise NotImplementedError(f'Unrecognized event type "{type(event)}": {event!r}')
+            self.handle_tree_hitting_boundary_match(event)
 
     def handle_blossom_imploding(self, event: BlossomImplodeEvent):
         blossom_io_node = event.blossom_region.alt_tree_node
@@ -69,28 +87,32 @@ class Mwpm:
 
         # The even length path becomes matches.
         # Set region growth to zero for newly matched regions to ensure they are rescheduled
+        growth_updates: List[Tuple[GraphFillRegion, int]] = []
         for match_region in matches.pairs_matched():
-            self.fill_system.set_region_growth(match_region, new_growth=0)
-            self.fill_system.set_region_growth(match_region.match.region, new_growth=0)
+            growth_updates.append((match_region, 0))
+            growth_updates.append((match_region.match.region, 0))
 
         # The odd length path is inserted into the alternating tree.
         ancestor = blossom_io_node.parent.node
-        ancestor.children = [e for e in ancestor.children if e.node is not blossom_io_node]
+        ancestor.remove_child(blossom_io_node)
         cur_alt_tree_node = ancestor
         child_edge = blossom_io_node.parent.edge.reversed()
-        for k in range(0, len(odds) - 1, 2):
+        odd_edges = odds.edges
+        for k in range(0, len(odd_edges) - 1, 2):
+            inner = odd_edges[k]
+            outer = odd_edges[k + 1]
             cur_alt_tree_node = cur_alt_tree_node.make_child_inner_outer(
-                inner_graph_fill_region=odds[k].region,
-                outer_graph_fill_region=odds[k + 1].region,
-                inner_outer_edge=odds[k].edge,
+                inner_graph_fill_region=inner.region,
+                outer_graph_fill_region=outer.region,
+                inner_outer_edge=inner.edge,
                 child_edge=child_edge
             )
-            child_edge = odds[k + 1].edge
-            self.fill_system.set_region_growth(cur_alt_tree_node.inner_region, new_growth=-1)
-            self.fill_system.set_region_growth(cur_alt_tree_node.outer_region, new_growth=+1)
+            child_edge = outer.edge
+            growth_updates.append((cur_alt_tree_node.inner_region, -1))
+            growth_updates.append((cur_alt_tree_node.outer_region, +1))
 
-        blossom_io_node.inner_region = odds[-1].region
-        odds[-1].region.alt_tree_node = blossom_io_node
+        blossom_io_node.inner_region = odd_edges[-1].region
+        odd_edges[-1].region.alt_tree_node = blossom_io_node
         blossom_io_node.parent = None
         cur_alt_tree_node.add_child(
             child=AltTreeEdge(
@@ -98,7 +120,8 @@ class Mwpm:
                 edge=child_edge
             )
         )
-        self.fill_system.set_region_growth(blossom_io_node.inner_region, new_growth=-1)
+        growth_updates.append((blossom_io_node.inner_region, -1))
+        self.fill_system.set_region_growths(growth_updates)
 
     def handle_tree_hitting_match(self, event: RegionHitRegionEvent):
         """An outer node from an alternating tree hit a matched node from a match.
@@ -108,31 +131,30 @@ class Mwpm:
         Args:
             event: Event data including the two regions that are colliding.
         """
-        if event.region2.match is not None:
-            node = event.region1.alt_tree_node
-            match = event.region2
-            child_edge = event.edge
+        region1 = event.region1
+        region2 = event.region2
+        if region2.match is not None:
+            node, match, child_edge = region1.alt_tree_node, region2, event.edge
         else:
-            node = event.region2.alt_tree_node
-            match = event.region1
-            child_edge = event.edge.reversed()
+            node, match, child_edge = region2.alt_tree_node, region1, event.edge.reversed()
         other_match = match.match
+        partner = other_match.region
         node.make_child_inner_outer(
             inner_graph_fill_region=match,
-            outer_graph_fill_region=other_match.region,
-            inner_outer_edge=match.match.edge,
+            outer_graph_fill_region=partner,
+            inner_outer_edge=other_match.edge,
             child_edge=child_edge
         )
         match.match = None
-        other_match.region.match = None
-        self.fill_system.set_region_growth(match, new_growth=-1)
-        self.fill_system.set_region_growth(other_match.region, new_growth=+1)
+        partner.match = None
+        self.fill_system.set_region_growths([(match, -1), (partner, +1)])
 
-    def _shatter_descendants_into_matches_and_freeze(self, node: AltTreeNode):
-        for matched_region in node.shatter_into_matches():
-            self.fill_system.set_region_growth(matched_region, new_growth=0)
-            self.fill_system.set_region_growth(matched_region.match.region, new_growth=0)
-        node.children = []
+    def _shatter_descendants_into_matches_and_freeze(
+            self,
+            node: AltTreeNode,
+            growth_updates: List[Tuple[GraphFillRegion, int]]
+    ) -> None:
+        node.shatter_into_matches(growth_updates)
 
     def handle_tree_hitting_boundary(
             self, event: RegionHitBoundaryEvent
@@ -151,26 +173,29 @@ class Mwpm:
         event.region.alt_tree_node = None
 
         # Shatter the alternating tree into matches.
-        self.fill_system.set_region_growth(node.outer_region, new_growth=0)
+        growth_updates = [(node.outer_region, 0)]
         node.become_root()
-        self._shatter_descendants_into_matches_and_freeze(node)
+        self._shatter_descendants_into_matches_and_freeze(node, growth_updates)
+        self.fill_system.set_region_growths(growth_updates)
 
     def handle_tree_hitting_boundary_match(
             self, event: RegionHitRegionEvent
     ):
-        incoming = event.region1
-        squished = event.region2
-        match_edge = event.edge
-        if incoming.is_matched_to_boundary():
-            incoming, squished = squished, incoming
-            match_edge = match_edge.reversed()
-        assert not incoming.is_matched_to_boundary()
+        # Exactly one of the regions is matched (to the boundary); the other is an outer region of a tree.
+        region1 = event.region1
+        region2 = event.region2
+        if region1.match is None:
+            incoming, squished, match_edge = region1, region2, event.edge
+        else:
+            incoming, squished, match_edge = region2, region1, event.edge.reversed()
+        assert incoming.match is None and squished.is_matched_to_boundary()
         node = incoming.alt_tree_node
         incoming.add_match(match=squished, edge=match_edge)
         # Shatter the alternating tree into matches.
-        self.fill_system.set_region_growth(node.outer_region, new_growth=0)
+        growth_updates = [(node.outer_region, 0)]
         node.become_root()
-        self._shatter_descendants_into_matches_and_freeze(node)
+        self._shatter_descendants_into_matches_and_freeze(node, growth_updates)
+        self.fill_system.set_region_growths(growth_updates)
 
     def handle_tree_hitting_self(self, event: RegionHitRegionEvent):
         """Two outer nodes from an alternating tree have hit each other.
@@ -188,17 +213,13 @@ class Mwpm:
         common_ancestor = region1.most_recent_common_ancestor(region2)
         p1 = region1.prune_upward_path_stopping_before(common_ancestor)
         p2 = region2.prune_upward_path_stopping_before(common_ancestor)
-        common_ancestor_children = common_ancestor.children
-        for child in common_ancestor_children:
+        # Determine what to add back into the tree, reusing the detached children list to collect the orphans.
+        orphans: List[AltTreeEdge] = common_ancestor.children
+        for child in orphans:
             child.node.parent = None
         common_ancestor.children = []
-
-        # Determine what to add back into the tree.
-        orphans: List[AltTreeEdge] = [
-            *common_ancestor_children,
-            *p1.orphans,
-            *p2.orphans,
-        ]
+        orphans += p1.orphans
+        orphans += p2.orphans
         region1_to_region2 = RegionEdge(
                 region=event.region1,
                 edge=event.edge
@@ -229,23 +250,27 @@ class Mwpm:
         Args:
             event: Event data including the two regions that are colliding.
         """
-        region1 = event.region1.alt_tree_node
-        region2 = event.region2.alt_tree_node
+        region1 = event.region1
+        region2 = event.region2
+        node1 = region1.alt_tree_node
+        node2 = region2.alt_tree_node
 
-        assert not region1.in_same_tree_as(region2)
+        assert not node1.in_same_tree_as(node2)
 
-        region1.become_root()
-        region2.become_root()
+        region1.add_match(match=region2, edge=event.edge)
+        if (node1.inner_region is None and not node1.children
+                and node2.inner_region is None and not node2.children):
+            # Two lone regions (the most common case); there are no trees to rotate or shatter.
+            self.fill_system.set_region_growths([(region1, 0), (region2, 0)])
+            return
 
-        event.region1.add_match(
-            match=event.region2,
-            edge=event.edge
-        )
-        self.fill_system.set_region_growth(event.region1, new_growth=0)
-        self.fill_system.set_region_growth(event.region2, new_growth=0)
+        node1.become_root()
+        node2.become_root()
 
-        for r in [region1, region2]:
-            self._shatter_descendants_into_matches_and_freeze(r)
+        growth_updates = [(region1, 0), (region2, 0)]
+        for node in [node1, node2]:
+            self._shatter_descendants_into_matches_and_freeze(node, growth_updates)
+        self.fill_system.set_region_growths(growth_updates)
 
     def extract_matching_and_reset_graph(self) -> Tuple[List['CompressedEdge'], int, int]:
         match_list = []
@@ -256,9 +281,10 @@ class Mwpm:
             if r is not None:
                 assert r.match is not None
                 for m in r.to_subblossom_matches():
-                    match_list.append(m.match.edge)
-                    obs_mask ^= m.match.edge.obs_mask
-                    total_weight += m.match.edge.distance
+                    edge = m.match.edge
+                    match_list.append(edge)
+                    obs_mask ^= edge.obs_mask
+                    total_weight += edge.distance
         return match_list, total_weight, obs_mask
 
     def shatter_and_match(self, max_depth: int = 1) -> None:
@@ -277,7 +303,7 @@ class Mwpm:
                     seen.add(r.match.edge.loc_to.loc)
                     area += list(r.match.region.iter_total_area())
                 for a in area:
-                    a.invalidate_involved_schedule_items()
+                    self.fill_system.invalidate_events_at_location(a)
                 for m in r.to_subblossom_matches(max_depth=depth):
                     if not m.blossom_parent and (m.match.region is None or not m.match.region.blossom_parent):
                         matches.append(m.match.edge)
@@ -295,6 +321,7 @@ class Mwpm:
         for d in self.detection_events:
             r = d.top_region()
             if r is not None and r.id not in seen:
+                seen.add(r.id)
                 yield r
 
     def draw_areas(self, *, screen: 'pygame.Surface', scale: float):
@@ -320,19 +347,17 @@ class Mwpm:
                 r.match.edge.draw_path(screen=screen, scale=scale, rgb=(0, 0, 0), width=5)
 
     def draw_internal_blossom_edges(self, *, screen: 'pygame.Surface', scale: float):
-        seen = set()
         for r in self.iter_all_top_level_regions():
-            seen.add(r.id)
             r.draw_blossom_cycle_edges(screen=screen, scale=scale)
 
     def draw_alternating_tree_edges(self, *, screen: 'pygame.Surface', scale: float):
-        seen_outer_roots = set()
+        seen_trees = set()
         for r in self.iter_all_top_level_regions():
-            if r.alt_tree_node is not None:
-                root = r.alt_tree_node.find_root()
-                if root.outer_region.id not in seen_outer_roots:
-                    seen_outer_roots.add(root.outer_region.id)
-                    root.draw(screen=screen, scale=scale)
+            node = r.alt_tree_node
+            if node is not None and node.tree_id not in seen_trees:
+                # Only walk up to the root once per tree.
+                seen_trees.add(node.tree_id)
+                node.find_root().draw(screen=screen, scale=scale)
 
     def draw_detection_events(self, *, screen: 'pygame.Surface', scale: float):
         for e in self.detection_events:
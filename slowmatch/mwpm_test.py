@@ -1,8 +1,9 @@
 from typing import Optional, Callable
 
 from slowmatch.events import RegionHitRegionEvent, BlossomImplodeEvent
-from slowmatch.graph import DetectorNode
+from slowmatch.graph import DetectorNode, Graph
 from slowmatch.graph_fill_region import GraphFillRegion
+from slowmatch.graph_flooder import GraphFlooder
 from slowmatch.graph_flooder_test import RecordingFlooder
 from slowmatch.mwpm import Mwpm, TLocation
 from slowmatch.alternating_tree import AltTreeNode, AltTreeEdge
@@ -88,6 +89,26 @@ def region_hit_region_builder(fill: RecordingFlooder):
     return get_region, get_region_hit_region, get_blossom_cycle_edge
 
 
+def test_process_event_accepts_event_subclasses():
+    class TaggedRegionHitRegionEvent(RegionHitRegionEvent):
+        pass
+
+    fill = RecordingFlooder()
+    state = Mwpm(flooder=fill)
+    for i in range(2):
+        state.add_region(fill.create_region(i))
+    r, _, _ = region_hit_region_builder(fill)
+
+    state.process_event(TaggedRegionHitRegionEvent(
+        region1=r(0),
+        region2=r(1),
+        time=1,
+        edge=CompressedEdge(loc_from=DetectorNode(loc=0), loc_to=DetectorNode(loc=1), obs_mask=0, distance=1)
+    ))
+    assert r(0).match.region is r(1)
+    assert r(1).match.region is r(0)
+
+
 def test_match_then_blossom_then_match():
     fill = RecordingFlooder()
     state = Mwpm(flooder=fill)
@@ -289,3 +310,22 @@ def test_blossom_implosion():
         root=True
     )
     assert r(12).alt_tree_node == expected_tree.node
+
+
+def test_iter_all_top_level_regions_yields_each_region_once():
+    g = Graph()
+    for a, b in [(0, 1), (1, 2), (2, 0)]:
+        g.add_edge(a, b, weight=10, observables=0)
+    for a in range(3):
+        g.add_boundary_edge(a, weight=100, observables=0)
+    flooder = GraphFlooder(g)
+    state = Mwpm(flooder=flooder)
+    for a in range(3):
+        state.add_detection_event(a)
+    for _ in range(3):
+        state.process_event(flooder.next_event())
+
+    # All three detection events are inside one blossom.
+    regions = list(state.iter_all_top_level_regions())
+    assert len(regions) == 1
+    assert len(regions[0].blossom_children) == 3
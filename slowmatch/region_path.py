@@ -9,44 +9,55 @@ if TYPE_CHECKING:
 
 @dataclasses.dataclass
 class RegionEdge:
+    __slots__ = ('region', 'edge')
+
     region: 'GraphFillRegion'
     edge: Optional['CompressedEdge']
     
-    def _eq_values(self):
-        return (
-            self.region.id,
-            self.edge
-        )
-
     def __eq__(self, other: 'RegionEdge') -> bool:
-        return self._eq_values() == other._eq_values()
+        return self is other or (self.region.id == other.region.id and self.edge == other.edge)
 
     def __str__(self) -> str:
         return f"({self.region.id}, ({self.edge.loc_from.loc}, {self.edge.loc_to.loc}))"
 
 
-@dataclasses.dataclass
+def _new_region_edge(region: 'GraphFillRegion', edge: Optional['CompressedEdge']) -> RegionEdge:
+    """Equivalent to RegionEdge(region=region, edge=edge), but skips the generated __init__'s keyword handling."""
+    result = object.__new__(RegionEdge)
+    result.region = region
+    result.edge = edge
+    return result
+
+
+def _cyclic_run(items: List[RegionEdge], start: int, count: int) -> List[RegionEdge]:
+    """Returns `count` consecutive items starting at index `start`, wrapping around the end of the list."""
+    n = len(items)
+    start %= n
+    end = start + count
+    if end <= n:
+        return items[start:end]
+    result = items[start:]
+    result += items[:end - n]
+    return result
+
+
 class RegionPath:
-    edges: List[RegionEdge] = dataclasses.field(default_factory=lambda: [])
+    __slots__ = ('edges',)
+
+    def __init__(self, edges: Optional[List[RegionEdge]] = None):
+        self.edges: List[RegionEdge] = [] if edges is None else edges
+
+    def __repr__(self) -> str:
+        return f'RegionPath(edges={self.edges!r})'
 
     def reversed(self) -> 'RegionPath':
-        new_edges = []
-        n = len(self.edges)
-        for i in range(n - 1):
-            current_edge = self.edges[n-i-1]
-            next_edge = self.edges[n-i-2]
-            new_edges.append(
-                RegionEdge(
-                    region=current_edge.region,
-                    edge=next_edge.edge.reversed()
-                )
-            )
-        new_edges.append(
-            RegionEdge(
-                region=self.edges[0].region,
-                edge=None
-            )
-        )
+        edges = self.edges
+        # Walking backwards, each region links to the region that preceded it, along that region's edge reversed.
+        new_edges = [
+            _new_region_edge(current_edge.region, next_edge.edge.reversed())
+            for current_edge, next_edge in zip(edges[:0:-1], edges[-2::-1])
+        ]
+        new_edges.append(_new_region_edge(edges[0].region, None))
         return RegionPath(edges=new_edges)
 
     def split_between_regions(
@@ -59,34 +70,41 @@ class RegionPath:
             path between start_region and end_region
         """
         regions = self.edges
+        i = j = None
+        for k, r in enumerate(regions):
+            if r.region is start_region:
+                i = k
+            if r.region is end_region:
+                j = k
+            if i is not None and j is not None:
+                break
+        if i is None or j is None:
+            raise ValueError(f"Regions {start_region.id} and {end_region.id} are not both in path {self}")
+        # Walking the cycle from i to j (inclusive) visits n1 regions; walking from j back around to i visits n2.
         n = len(regions)
-        i = next(i for i, r in enumerate(regions) if r.region is start_region)
-        j = next(i for i, r in enumerate(regions) if r.region is end_region)
-        regions = regions * 2
-        result1 = regions[i: j + 1 + (n if j < i else 0)]
-        result2 = regions[j: i + 1 + (n if i <= j else 0)]
-        if len(result1) % 2 == 1:
-            return RegionPath(result1), RegionPath(result2[1:-1])
+        n1 = (j - i) % n + 1
+        n2 = n + 2 - n1
+        if n1 % 2 == 1:
+            return RegionPath(_cyclic_run(regions, i, n1)), RegionPath(_cyclic_run(regions, j + 1, n2 - 2))
         else:
-            return RegionPath(result2).reversed(), RegionPath(result1[1:-1])
+            return RegionPath(_cyclic_run(regions, j, n2)).reversed(), RegionPath(_cyclic_run(regions, i + 1, n1 - 2))
 
     def split_at_region(
             self,
             region: 'GraphFillRegion'
     ) -> 'RegionPath':
-        n = len(self)
         if region is None:
             raise ValueError("Region cannot be None")
-        if region not in [r.region for r in self]:
-            raise ValueError(f"Region with id {region.id} not in path {self}")
-        s = next(i for i, r in enumerate(self) if r.region is region)
-        return (self * 2)[s + 1:s + n]
+        edges = self.edges
+        for s, r in enumerate(edges):
+            if r.region is region:
+                return RegionPath(_cyclic_run(edges, s + 1, len(edges) - 1))
+        raise ValueError(f"Region with id {region.id} not in path {self}")
 
     def pairs_matched(self) -> Iterator['GraphFillRegion']:
-        assert len(self) % 2 == 0
-        for k in range(0, len(self), 2):
-            a = self[k]
-            b = self[k + 1]
+        edges = self.edges
+        assert len(edges) % 2 == 0
+        for a, b in zip(edges[::2], edges[1::2]):
             a.region.add_match(
                 match=b.region,
                 edge=a.edge
@@ -108,6 +126,10 @@ class RegionPath:
         return self.edges.__iter__()
 
     def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, RegionPath):
+            return NotImplemented
         return self.edges == other.edges
 
     def __mul__(self, other: int) -> 'RegionPath':
@@ -1,5 +1,7 @@
 from typing import List
 
+import pytest
+
 from slowmatch.region_path import RegionPath, RegionEdge
 from slowmatch.graph import DetectorNode
 from slowmatch.graph_fill_region import GraphFillRegion
@@ -7,18 +9,19 @@ from slowmatch.compressed_edge import CompressedEdge
 
 
 def gen_blossom_edge_path(region_ids: List[int]) -> RegionPath:
-    out_edges = []
-    for i in range(len(region_ids) - 1):
-        e = RegionEdge(
+    nodes = [DetectorNode(loc=r) for r in region_ids]
+    out_edges = [
+        RegionEdge(
             region=GraphFillRegion(id=region_ids[i]),
             edge=CompressedEdge(
-                loc_from=DetectorNode(loc=region_ids[i]),
-                loc_to=DetectorNode(loc=region_ids[i + 1]),
+                loc_from=nodes[i],
+                loc_to=nodes[i + 1],
                 obs_mask=0,
                 distance=1
             )
         )
-        out_edges.append(e)
+        for i in range(len(region_ids) - 1)
+    ]
     out_edges.append(
         RegionEdge(
             region=GraphFillRegion(id=region_ids[-1]),
@@ -34,20 +37,20 @@ def test_reverse_blossom_path():
 
 
 def gen_blossom_cycle(region_ids: List[int]) -> RegionPath:
-    out_edges = []
     n = len(region_ids)
-    for i in range(n):
-        e = RegionEdge(
+    nodes = [DetectorNode(loc=r) for r in region_ids]
+    return RegionPath([
+        RegionEdge(
             region=GraphFillRegion(id=region_ids[i]),
             edge = CompressedEdge(
-                loc_from=DetectorNode(loc=region_ids[i]),
-                loc_to=DetectorNode(loc=region_ids[(i + 1) % n]),
+                loc_from=nodes[i],
+                loc_to=nodes[(i + 1) % n],
                 obs_mask=0,
                 distance=1
             )
         )
-        out_edges.append(e)
-    return RegionPath(out_edges)
+        for i in range(n)
+    ])
 
 
 def test_split_blossom_cycle():
@@ -64,6 +67,15 @@ def test_split_blossom_cycle():
     odds, evens = blossom_cycle.split_between_regions(blossom_cycle[1].region, blossom_cycle[2].region)
     assert odds == gen_blossom_edge_path([1, 0, 4, 3, 2])
     assert evens == RegionPath()
+    odds, evens = blossom_cycle.split_between_regions(blossom_cycle[2].region, blossom_cycle[2].region)
+    assert odds == RegionPath([blossom_cycle[2]])
+    assert evens == RegionPath([blossom_cycle[3], blossom_cycle[4], blossom_cycle[0], blossom_cycle[1]])
+
+
+def test_split_blossom_cycle_missing_region():
+    blossom_cycle = gen_blossom_cycle([0, 1, 2])
+    with pytest.raises(ValueError):
+        blossom_cycle.split_between_regions(blossom_cycle[0].region, GraphFillRegion(id=5))
 
 
 def test_split_blossom_cycle_at_region():
@@ -75,3 +87,14 @@ def test_split_blossom_cycle_at_region():
     bc = gen_blossom_cycle([0])
     region_path = bc.split_at_region(bc[0].region)
     assert region_path == RegionPath()
+    with pytest.raises(ValueError):
+        bc.split_at_region(GraphFillRegion(id=5))
+
+
+def test_region_path_equality():
+    path = gen_blossom_cycle([0, 1, 2])
+    assert path == path
+    assert path == RegionPath(list(path.edges))
+    assert path != RegionPath(path.edges[:2])
+    assert path != gen_blossom_cycle([0, 1, 3])
+    assert path != 'not a path'
@@ -1,37 +1,136 @@
+import itertools
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, Union, Tuple, List
 
 import typer
 import stim
 import numpy as np
 from tqdm import trange
-import matplotlib.pyplot as plt
 
 from slowmatch.exposed import Matching
 from slowmatch.mwpm import Mwpm
 
+# Shots below this count per worker aren't worth the cost of shipping them to another process.
+MIN_SHOTS_PER_WORKER = 256
+
+_worker_matching_graph: Optional[Matching] = None
+
+
+def _init_decoding_worker(error_model: stim.DetectorErrorModel) -> None:
+    global _worker_matching_graph
+    _worker_matching_graph = Matching(error_model)
+
+
+def _decode_shots(matching_graph: Matching,
+                  dets: np.ndarray,
+                  verbose: bool = False,
+                  bit_packed: bool = False) -> np.ndarray:
+    if not verbose:
+        return matching_graph.decode_batch(dets, bit_packed=bit_packed)
+    # Hand the shots over one at a time, so the progress bar advances per shot.
+    predictions = np.zeros(shape=(dets.shape[0], matching_graph.num_observables), dtype=np.bool_)
+    for k in trange(dets.shape[0]):
+        predictions[k] = matching_graph.decode_batch(dets[k:k + 1], bit_packed=bit_packed)[0]
+    return predictions
+
+
+def _decode_shots_in_worker(dets: np.ndarray, bit_packed: bool) -> np.ndarray:
+    return _decode_shots(_worker_matching_graph, dets, bit_packed=bit_packed)
+
+
+def _decoding_pool(num_workers: int, error_model: stim.DetectorErrorModel) -> ProcessPoolExecutor:
+    # Workers are started from a fresh server process rather than forked from this one, which may be running the
+    # sampling thread of count_logical_errors (forking a process with threads can deadlock the child).
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+    else:
+        context = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(max_workers=num_workers,
+                               mp_context=context,
+                               initializer=_init_decoding_worker,
+                               initargs=(error_model,))
+
+
+def _decode_shots_in_pool(executor: ProcessPoolExecutor,
+                          dets: np.ndarray,
+                          num_chunks: int,
+                          bit_packed: bool) -> np.ndarray:
+    chunk_predictions = executor.map(_decode_shots_in_worker,
+                                     np.array_split(dets, num_chunks),
+                                     itertools.repeat(bit_packed))
+    return np.concatenate(list(chunk_predictions))
+
+
+def _check_worker_options(num_workers: int, verbose: bool, enable_logger: bool) -> None:
+    if num_workers > 1 and (verbose or enable_logger):
+        raise ValueError("verbose and enable_logger aren't supported when decoding with num_workers > 1.")
+
 
 def predict_observable_errors_using_slowmatch(circuit: stim.Circuit,
                                               det_samples: np.ndarray,
                                               verbose: bool = False,
-                                              enable_logger: bool = False
-                                              ) -> Union[np.ndarray, Tuple[np.ndarray, Matching]]:
-    """Turn detection events into predicted observable errors."""
-    error_model = circuit.detector_error_model(decompose_errors=True)
-    matching_graph = Matching(error_model, enable_logger=enable_logger)
+                                              enable_logger: bool = False,
+                                              matching_graph: Optional[Matching] = None,
+                                              num_workers: int = 1,
+                                              bit_packed: bool = False,
+                                              error_model: Optional[stim.DetectorErrorModel] = None
+                                              ) -> Union[np.ndarray, Tuple[np.ndarray, Optional[Matching]]]:
+    """Turn detection events into predicted observable errors.
+
+    Pass the `Matching` returned by an earlier call as `matching_graph` to decode more shots of the same circuit
+    without rebuilding it from the detector error model. Likewise, pass the circuit's
+    `detector_error_model(decompose_errors=True)` as `error_model` if it's already at hand.
+
+    With `num_workers > 1` the shots are split into chunks of at least `MIN_SHOTS_PER_WORKER` shots and decoded in
+    separate processes, each of which builds its own `Matching` once. Progress bars and loggers can't be reported from
+    those processes, so `verbose` and `enable_logger` must be False. No `Matching` is built in this process unless it
+    decodes the shots itself (when there are too few shots to split), so the returned `matching_graph` may be None.
+
+    With `bit_packed=True`, `det_samples` holds stim's bit packed samples (little endian bits in uint8 bytes), and
+    each shot is unpacked just before it is decoded.
+    """
+    _check_worker_options(num_workers, verbose, enable_logger)
 
     num_shots = det_samples.shape[0]
-    num_obs = circuit.num_observables
     num_dets = circuit.num_detectors
-    assert det_samples.shape[1] == num_dets
+    if bit_packed:
+        assert det_samples.shape[1] == (num_dets + 7) // 8
+    else:
+        assert det_samples.shape[1] == num_dets
+
+    num_chunks = min(num_workers, num_shots // MIN_SHOTS_PER_WORKER)
+    if num_chunks <= 1:
+        if matching_graph is None:
+            if error_model is None:
+                error_model = circuit.detector_error_model(decompose_errors=True)
+            matching_graph = Matching(error_model, enable_logger=enable_logger)
+        return _decode_shots(matching_graph, det_samples, verbose=verbose, bit_packed=bit_packed), matching_graph
+
+    if error_model is None:
+        error_model = circuit.detector_error_model(decompose_errors=True)
+    with _decoding_pool(num_chunks, error_model) as executor:
+        return _decode_shots_in_pool(executor, det_samples, num_chunks, bit_packed), matching_graph
+
 
-    predictions = np.zeros(shape=(num_shots, num_obs), dtype=np.bool8)
-    myrange = range if not verbose else trange
-    for k in myrange(num_shots):
-        expanded_det = np.resize(det_samples[k], num_dets + 1)
-        expanded_det[-1] = 0
-        out = matching_graph.decode(expanded_det)
-        predictions[k] = out.predicted_observables
-    return predictions, matching_graph
+def _sample_chunks(sampler: stim.CompiledDetectorSampler,
+                   num_shots: int,
+                   chunk_size: int,
+                   chunks: queue.Queue,
+                   stop: threading.Event) -> None:
+    """Puts sampled chunks on the queue, followed by None or by the exception that stopped the sampling."""
+    end = None
+    try:
+        for start in range(0, num_shots, chunk_size):
+            if stop.is_set():
+                break
+            chunks.put(sampler.sample(min(chunk_size, num_shots - start), separate_observables=True, bit_packed=True))
+    except Exception as ex:
+        end = ex
+    finally:
+        chunks.put(end)
 
 
 def count_logical_errors(
@@ -39,26 +138,81 @@ def count_logical_errors(
         num_shots: int,
         seed: int = 0,
         verbose: bool = False,
-        enable_logger: bool = False
+        enable_logger: bool = False,
+        matching_graph: Optional[Matching] = None,
+        num_workers: int = 1,
+        chunk_size: Optional[int] = None,
+        error_model: Optional[stim.DetectorErrorModel] = None
     ) -> Union[int, Tuple[int, List[Mwpm]]]:
-    shots = circuit.compile_detector_sampler(seed=seed).sample(num_shots, append_observables=True)
-
-    detector_parts = shots[:, :circuit.num_detectors]
-    actual_observable_parts = shots[:, circuit.num_detectors:]
-    predicted_observable_parts, matching = predict_observable_errors_using_slowmatch(
-                 circuit,
-                 detector_parts,
-                 verbose=verbose,
-                 enable_logger=enable_logger
-    )
-    num_errors = 0
-    for actual, predicted in zip(actual_observable_parts, predicted_observable_parts):
-        if not np.array_equal(actual, predicted):
-            num_errors += 1
-    return num_errors, matching
+    """Samples shots of the circuit and counts how many of them slowmatch decodes incorrectly.
+
+    With `chunk_size`, shots are sampled `chunk_size` at a time on a background thread while the previous chunk is
+    being decoded, so only a couple of chunks are held in memory at once. Stim releases the GIL while sampling, so this
+    overlaps sampling with decoding. The sampled shots differ from those of an unchunked run with the same seed.
+
+    `num_workers` is as for `predict_observable_errors_using_slowmatch`, with a single pool of worker processes
+    serving every chunk.
+    """
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, not {chunk_size}.")
+    _check_worker_options(num_workers, verbose, enable_logger)
+    # Build the error model at most once, rather than once per chunk.
+    if error_model is None and (matching_graph is None or num_workers > 1):
+        error_model = circuit.detector_error_model(decompose_errors=True)
+    if matching_graph is None and num_workers <= 1:
+        matching_graph = Matching(error_model, enable_logger=enable_logger)
+    sampler = circuit.compile_detector_sampler(seed=seed)
+
+    chunks = queue.Queue(maxsize=2)
+    stop = threading.Event()
+    producer = None
+    executor = _decoding_pool(num_workers, error_model) if num_workers > 1 else None
+    try:
+        if chunk_size is None:
+            chunks.put(sampler.sample(num_shots, separate_observables=True, bit_packed=True))
+            chunks.put(None)
+        else:
+            producer = threading.Thread(target=_sample_chunks, args=(sampler, num_shots, chunk_size, chunks, stop))
+            producer.start()
+
+        num_errors = 0
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+            detector_parts, actual_observable_parts = chunk
+            num_chunks = min(num_workers, detector_parts.shape[0] // MIN_SHOTS_PER_WORKER)
+            if num_chunks > 1:
+                predicted_observable_parts = _decode_shots_in_pool(executor, detector_parts, num_chunks, True)
+            else:
+                if matching_graph is None:
+                    # Too few shots in this chunk to split between the workers.
+                    matching_graph = Matching(error_model, enable_logger=enable_logger)
+                predicted_observable_parts = _decode_shots(matching_graph, detector_parts, verbose=verbose,
+                                                           bit_packed=True)
+            predicted_observable_parts = np.packbits(predicted_observable_parts, axis=1, bitorder='little')
+            num_errors += int(np.count_nonzero(
+                np.bitwise_xor(actual_observable_parts, predicted_observable_parts).any(axis=1)))
+    finally:
+        if producer is not None:
+            # Unblock the producer if the queue is full, then wait for it to notice the stop request.
+            stop.set()
+            while producer.is_alive():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            producer.join()
+        if executor is not None:
+            executor.shutdown()
+    return num_errors, matching_graph
 
 
 def repetition_code_threshold():
+    import matplotlib.pyplot as plt
+
     seed = 0
     num_shots = 10000
     for d in [3, 5, 7]:
@@ -84,6 +238,8 @@ def repetition_code_threshold():
 
 
 def surface_code_threshold_example():
+    import matplotlib.pyplot as plt
+
     num_shots = 1000
     seed = 0
     ds = [3, 5, 7]
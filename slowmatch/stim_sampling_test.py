@@ -1,6 +1,19 @@
+import queue
+import threading
+
+import numpy as np
 import stim
 import pytest
-from slowmatch.stim_sampling import count_logical_errors
+from slowmatch import stim_sampling
+from slowmatch.stim_sampling import count_logical_errors, predict_observable_errors_using_slowmatch
+
+
+def repetition_code_circuit(d: int, noise: float) -> stim.Circuit:
+    return stim.Circuit.generated(
+        "repetition_code:memory",
+        rounds=d * 3,
+        distance=d,
+        before_round_data_depolarization=noise)
 
 
 @pytest.mark.parametrize(
@@ -8,10 +21,85 @@ from slowmatch.stim_sampling import count_logical_errors
     [(3, 0.1, 100), (5, 0.2, 100)]
 )
 def test_stim_repetition_code(d, noise, num_shots):
-    circuit = stim.Circuit.generated(
-        "repetition_code:memory",
-        rounds=d * 3,
-        distance=d,
-        before_round_data_depolarization=noise)
+    circuit = repetition_code_circuit(d, noise)
     count_logical_errors(circuit, num_shots)
 
+
+def test_count_logical_errors_reuses_matching_graph():
+    circuit = repetition_code_circuit(d=3, noise=0.1)
+    num_errors, matching = count_logical_errors(circuit, 100)
+    reused_num_errors, reused_matching = count_logical_errors(circuit, 100, matching_graph=matching)
+    assert reused_matching is matching
+    assert reused_num_errors == num_errors
+
+
+def test_count_logical_errors_with_multiple_workers():
+    circuit = repetition_code_circuit(d=3, noise=0.1)
+    num_errors, _ = count_logical_errors(circuit, 600)
+    parallel_num_errors, _ = count_logical_errors(circuit, 600, num_workers=2)
+    assert parallel_num_errors == num_errors
+
+    dets = circuit.compile_detector_sampler(seed=0).sample(600)
+    predictions, matching = predict_observable_errors_using_slowmatch(circuit, dets)
+    parallel_predictions, parallel_matching = predict_observable_errors_using_slowmatch(circuit, dets, num_workers=2)
+    np.testing.assert_array_equal(parallel_predictions, predictions)
+    assert parallel_matching is None  # Only the workers needed one.
+
+    with pytest.raises(ValueError):
+        predict_observable_errors_using_slowmatch(circuit, dets, num_workers=2, verbose=True)
+    with pytest.raises(ValueError):
+        count_logical_errors(circuit, 600, num_workers=2, enable_logger=True)
+
+
+def test_predict_observable_errors_from_bit_packed_samples():
+    circuit = repetition_code_circuit(d=3, noise=0.1)
+    dets = circuit.compile_detector_sampler(seed=0).sample(100)
+    predictions, matching = predict_observable_errors_using_slowmatch(circuit, dets)
+    packed_predictions, _ = predict_observable_errors_using_slowmatch(
+        circuit,
+        np.packbits(dets, axis=1, bitorder='little'),
+        matching_graph=matching,
+        bit_packed=True)
+    np.testing.assert_array_equal(packed_predictions, predictions)
+
+
+def test_count_logical_errors_in_chunks():
+    circuit = repetition_code_circuit(d=3, noise=0.1)
+    assert count_logical_errors(circuit, 100, chunk_size=100)[0] == count_logical_errors(circuit, 100)[0]
+    assert count_logical_errors(circuit, 100, chunk_size=30)[0] == count_logical_errors(circuit, 100, chunk_size=30)[0]
+    num_errors, matching = count_logical_errors(circuit, 0, chunk_size=30)
+    assert num_errors == 0
+    assert matching is not None
+
+
+@pytest.mark.parametrize("chunk_size", [0, -5])
+def test_count_logical_errors_rejects_non_positive_chunk_size(chunk_size):
+    with pytest.raises(ValueError):
+        count_logical_errors(repetition_code_circuit(d=3, noise=0.1), 100, chunk_size=chunk_size)
+
+
+def test_sample_chunks_forwards_sampler_failure():
+    class FailingSampler:
+        def sample(self, *args, **kwargs):
+            raise RuntimeError('fail')
+
+    chunks = queue.Queue(maxsize=2)
+    stim_sampling._sample_chunks(FailingSampler(), 100, 30, chunks, threading.Event())
+    assert isinstance(chunks.get(), RuntimeError)
+
+
+def test_count_logical_errors_in_chunks_with_multiple_workers(monkeypatch):
+    circuit = repetition_code_circuit(d=3, noise=0.1)
+    num_pools = 0
+    make_pool = stim_sampling._decoding_pool
+
+    def counting_pool(*args):
+        nonlocal num_pools
+        num_pools += 1
+        return make_pool(*args)
+
+    monkeypatch.setattr(stim_sampling, '_decoding_pool', counting_pool)
+    num_errors, _ = count_logical_errors(circuit, 2000, chunk_size=600)
+    parallel_num_errors, _ = count_logical_errors(circuit, 2000, chunk_size=600, num_workers=2)
+    assert parallel_num_errors == num_errors
+    assert num_pools == 1
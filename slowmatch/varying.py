@@ -1,13 +1,20 @@
 import numbers
 from typing import Union, Optional
 
-import cirq
-
 
 class Varying:
-    """A value that is varying linearly over time."""
+    """A value that is varying linearly over time.
+
+    Instances are never mutated after construction, so shared constants such as `Varying.T` and `Varying.ZERO` can
+    be handed out instead of allocating equal copies.
+    """
+
+    # `_base` is the value at time 0; any base_time given to the constructor is
+    # folded into it so evaluation is a single multiply-add.
+    __slots__ = ('slope', '_base')
 
     T: 'Varying'  # The line y(t) = 1*t + 0
+    ZERO: 'Varying'  # The constant line y(t) = 0
 
     def __init__(
         self,
@@ -20,48 +27,47 @@ class Varying:
             assert slope == 0 and base_time == 0
             self.slope = base.slope
             self._base = base._base
-            self._base_time = base._base_time
         else:
             self.slope = float(slope)
-            self._base = float(base)
-            self._base_time = float(base_time)
+            self._base = float(base) - float(base_time) * self.slope
 
     def __call__(self, time: float):
-        return self._base + (time - self._base_time) * self.slope
+        slope = self.slope
+        if not slope:
+            return self._base
+        return self._base + time * slope
 
     def __neg__(self):
         return self * -1
 
     def __mul__(self, other: Union[int, float]) -> 'Varying':
         if isinstance(other, (int, float)):
-            return Varying(
-                base_time=self._base_time, slope=self.slope * other, base=self._base * other
-            )
+            return Varying(slope=self.slope * other, base=self._base * other)
         return NotImplemented
 
     def __truediv__(self, other: Union[int, float]) -> 'Varying':
         if isinstance(other, (int, float)):
-            return Varying(
-                base_time=self._base_time, slope=self.slope / other, base=self._base / other
-            )
+            return Varying(slope=self.slope / other, base=self._base / other)
         return NotImplemented
 
     def __add__(self, other: Union[int, float, 'Varying']) -> 'Varying':
         if isinstance(other, (int, float)):
-            return Varying(base_time=self._base_time, slope=self.slope, base=self._base + other)
+            return Varying(slope=self.slope, base=self._base + other)
         if isinstance(other, Varying):
-            return Varying(
-                base_time=self._base_time,
-                slope=self.slope + other.slope,
-                base=self._base + other(self._base_time),
-            )
+            return Varying(slope=self.slope + other.slope, base=self._base + other._base)
         return NotImplemented
 
     def __sub__(self, other: Union[int, float, 'Varying']) -> 'Varying':
-        return self.__add__(-other)
+        if isinstance(other, (int, float)):
+            return Varying(slope=self.slope, base=self._base - other)
+        if isinstance(other, Varying):
+            return Varying(slope=self.slope - other.slope, base=self._base - other._base)
+        return NotImplemented
 
     def __rsub__(self, other: Union[int, float, 'Varying']) -> 'Varying':
-        return -self.__sub__(other)
+        if isinstance(other, (int, float)):
+            return Varying(slope=-self.slope, base=other - self._base)
+        return NotImplemented
 
     __rmul__ = __mul__
     __radd__ = __add__
@@ -85,7 +91,7 @@ class Varying:
         if self.slope == 0 and isinstance(other, numbers.Number):
             return self._base == other
         if isinstance(other, Varying):
-            return self.slope == other.slope and self(0) == other(0)
+            return self.slope == other.slope and self._base == other._base
         return NotImplemented
 
     def then_slope_at(self, *, time_of_change: float, new_slope: float) -> 'Varying':
@@ -94,28 +100,26 @@ class Varying:
     def zero_intercept(self) -> Optional[float]:
         if self.slope == 0:
             return None
-        return self._base_time - self._base / self.slope
+        return -self._base / self.slope
 
     def _approx_eq_(self, other, atol: float):
         if self.slope == 0 and isinstance(other, numbers.Number):
-            return cirq.approx_eq(self._base, other, atol=atol)
+            return abs(self._base - other) <= atol
         if isinstance(other, Varying):
-            return cirq.approx_eq(self.slope, other.slope, atol=atol) and cirq.approx_eq(
-                self(0), other(0), atol=atol
-            )
+            return abs(self.slope - other.slope) <= atol and abs(self._base - other._base) <= atol
         return NotImplemented
 
     def __hash__(self):
         if self.slope == 0:
             return hash(self._base)
-        return hash((Varying, self(0), self.slope))
+        return hash((Varying, self._base, self.slope))
 
     def __str__(self):
-        return f'{self(0)} + T*{self.slope}'
+        return f'{self._base} + T*{self.slope}'
 
     def __repr__(self):
-
-        return f'({self(0)!r} + {self.slope!r}*Varying.T)'
+        return f'({self._base!r} + {self.slope!r}*Varying.T)'
 
 
 Varying.T = Varying(slope=1)
+Varying.ZERO = Varying(0)
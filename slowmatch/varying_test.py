@@ -6,22 +6,19 @@ from slowmatch.varying import Varying
 
 def test_init():
     z = Varying()
-    assert z._base_time == 0
     assert z._base == 0
     assert z.slope == 0
     assert z(0) == 0
     assert z(1) == 0
 
     z = Varying(base=2, base_time=3, slope=5)
-    assert z._base_time == 3
-    assert z._base == 2
+    assert z._base == -13
     assert z.slope == 5
     assert z(0) == -13
     assert z(1) == -8
 
     z = Varying(z)
-    assert z._base_time == 3
-    assert z._base == 2
+    assert z._base == -13
     assert z.slope == 5
     assert z(0) == -13
     assert z(1) == -8
@@ -69,41 +66,33 @@ def test_arithmetic():
     b = Varying(base_time=7, slope=11, base=13)
 
     add = a + b
-    assert add._base_time == a._base_time
     assert a(20) + b(20) == add(20)
     assert a(30) + b(30) == add(30)
 
     sub = a - b
-    assert add._base_time == a._base_time
     assert a(20) - b(20) == sub(20)
     assert a(30) - b(30) == sub(30)
 
     neg = -a
-    assert neg._base_time == a._base_time
     assert a(20) == -neg(20)
     assert a(30) == -neg(30)
 
     offset1 = a + 2
     offset2 = 2 + a
-    assert add._base_time == a._base_time
     assert a(20) + 2 == offset1(20) == offset2(20)
     assert a(30) + 2 == offset1(30) == offset2(30)
 
     dif1 = a - 2
     dif2 = 2 - a
-    assert add._base_time == a._base_time
     assert a(20) - 2 == dif1(20) == -dif2(20)
     assert a(30) - 2 == dif1(30) == -dif2(30)
 
     double1 = a * 2
     double2 = 2 * a
-    assert double1._base_time == a._base_time
-    assert double2._base_time == a._base_time
     assert double1(20) == double2(20) == a(20) * 2
     assert double1(30) == double2(30) == a(30) * 2
 
     half = a / 2
-    assert half._base_time == a._base_time
     assert half(20) == a(20) / 2
     assert half(30) == a(30) / 2
 
@@ -141,7 +130,6 @@ def test_scalar():
 def test_then_slope_at():
     a = Varying(base_time=2, slope=3, base=5)
     b = a.then_slope_at(time_of_change=7, new_slope=11)
-    assert b._base_time == 7
     assert b(7) == a(7)
     assert b.slope == 11
 